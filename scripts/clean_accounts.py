@@ -11,52 +11,59 @@ import sys
 from pathlib import Path
 import polars as pl
 from utils import (
-    extract_domain,
-    normalize_country,
+    extract_domain_expr,
+    normalize_country_expr,
     normalize_column_name,
+    cleaning_stats,
+    sink_csv,
     ACCOUNT_COLUMN_SCHEMA,
 )
 
 
-def clean_accounts(input_path: str, output_path: str, verbose: bool = True) -> dict:
+def build_accounts_lf(input_path: str, verbose: bool = True) -> tuple:
     """
-    Clean account/company data from CSV
+    Build the lazy account/company cleaning pipeline for a CSV
+    
+    Only the CSV schema is inferred here; the returned LazyFrames are
+    executed by sink_csv (or sink_csv_all when cleaning several files).
     
     Args:
         input_path: Path to input CSV file
-        output_path: Path to save cleaned CSV
         verbose: Print progress messages
         
     Returns:
-        Dict with cleaning statistics
+        Tuple of (cleaned LazyFrame, LazyFrame of row counts for the stats)
     """
     
     if verbose:
         print(f"📂 Reading accounts from: {input_path}")
     
-    # Load CSV
+    # Scan CSV lazily so the whole pipeline can run on the streaming engine
     try:
-        df = pl.read_csv(input_path)
+        lf = pl.scan_csv(input_path, infer_schema_length=10_000)
+        columns = lf.collect_schema().names()
     except Exception as e:
         print(f"❌ Error reading CSV: {e}")
         sys.exit(1)
     
-    original_count = len(df)
+    # Keep a handle on the scanned rows so they can be counted at export time
+    scanned_lf = lf
+    
     if verbose:
-        print(f"📊 Loaded {original_count} rows")
-        print(f"📋 Columns: {df.columns}")
+        print(f"📋 Columns: {columns}")
     
     # Step 1: Normalize column names
     if verbose:
         print("\n🔧 Step 1: Normalizing column names...")
     
-    df = df.rename({
+    lf = lf.rename({
         col: normalize_column_name(col)
-        for col in df.columns
+        for col in columns
     })
+    columns = lf.collect_schema().names()
     
     if verbose:
-        print(f"   ✅ Normalized to: {df.columns}")
+        print(f"   ✅ Normalized to: {columns}")
     
     # Step 2: Clean company name
     if verbose:
@@ -65,7 +72,7 @@ def clean_accounts(input_path: str, output_path: str, verbose: bool = True) -> d
     # Check for name column variations
     name_col = None
     for possible in ["name", "company_name", "company", "account_name"]:
-        if possible in df.columns:
+        if possible in columns:
             name_col = possible
             break
     
@@ -75,12 +82,12 @@ def clean_accounts(input_path: str, output_path: str, verbose: bool = True) -> d
     
     # Standardize to 'name'
     if name_col != "name":
-        df = df.rename({name_col: "name"})
+        lf = lf.rename({name_col: "name"})
     
-    # Clean name field
-    df = df.with_columns([
-        pl.col("name").str.strip().alias("name")
-    ])
+    # Clean name field (all field cleaning is applied in one pass after step 4)
+    clean_exprs = [
+        pl.col("name").str.strip_chars().alias("name")
+    ]
     
     if verbose:
         print("   ✅ Company names cleaned")
@@ -92,106 +99,104 @@ def clean_accounts(input_path: str, output_path: str, verbose: bool = True) -> d
     # Check for website column
     website_col = None
     for possible in ["website", "web_site", "url", "domain"]:
-        if possible in df.columns:
+        if possible in columns:
             website_col = possible
             break
     
     if website_col:
         # Standardize to 'website'
         if website_col != "website":
-            df = df.rename({website_col: "website"})
+            lf = lf.rename({website_col: "website"})
         
         # Clean website and extract domain
-        df = df.with_columns([
-            pl.col("website").str.to_lowercase().str.strip().alias("website"),
-            pl.col("website")
-              .map_elements(extract_domain, return_dtype=pl.Utf8)
-              .alias("domain")
-        ])
+        clean_exprs += [
+            pl.col("website").str.to_lowercase().str.strip_chars().alias("website"),
+            extract_domain_expr(pl.col("website")).alias("domain")
+        ]
         
         if verbose:
             print("   ✅ Domains extracted from websites")
     else:
         if verbose:
             print("   ⚠️ No website column found, creating empty domain column")
-        df = df.with_columns([
+        clean_exprs.append(
             pl.lit(None, dtype=pl.Utf8).alias("domain")
-        ])
+        )
     
     # Step 4: Clean and standardize other fields
     if verbose:
         print("\n🔧 Step 4: Standardizing data fields...")
     
     # Country normalization
-    if "country" in df.columns:
-        df = df.with_columns([
-            pl.col("country").map_elements(normalize_country, return_dtype=pl.Utf8).alias("country")
-        ])
+    if "country" in columns:
+        clean_exprs.append(
+            normalize_country_expr(pl.col("country")).cast(pl.Categorical).alias("country")
+        )
         if verbose:
             print("   ✅ Normalized countries")
     
     # Clean industry
-    if "industry" in df.columns:
-        df = df.with_columns([
-            pl.col("industry").str.strip().str.title().alias("industry")
-        ])
+    if "industry" in columns:
+        clean_exprs.append(
+            pl.col("industry").str.strip_chars().str.to_titlecase().cast(pl.Categorical).alias("industry")
+        )
         if verbose:
             print("   ✅ Standardized industries")
     
-    # Clean employee_count (ensure it's numeric)
-    if "employee_count" in df.columns:
-        df = df.with_columns([
-            pl.col("employee_count").cast(pl.Int32, strict=False).alias("employee_count")
-        ])
+    # Clean employee_count (ensure it's numeric; via Float64 so "250.0" -> 250)
+    if "employee_count" in columns:
+        clean_exprs.append(
+            pl.col("employee_count")
+              .cast(pl.Float64, strict=False)
+              .cast(pl.Int32, strict=False)
+              .alias("employee_count")
+        )
         if verbose:
             print("   ✅ Validated employee counts")
     
     # Clean status
-    if "status" in df.columns:
-        df = df.with_columns([
-            pl.col("status").str.to_lowercase().str.strip().alias("status")
-        ])
+    if "status" in columns:
+        clean_exprs.append(
+            pl.col("status").str.to_lowercase().str.strip_chars().cast(pl.Categorical).alias("status")
+        )
     else:
         # Add default status
-        df = df.with_columns([
-            pl.lit("prospect").alias("status")
-        ])
+        clean_exprs.append(
+            pl.lit("prospect", dtype=pl.Categorical).alias("status")
+        )
+    
+    # Apply all field cleaning in a single with_columns so Polars can fuse it
+    lf = lf.with_columns(clean_exprs)
     
     # Step 5: Filter out invalid records
     if verbose:
         print("\n🔧 Step 5: Filtering invalid records...")
     
-    before_filter = len(df)
-    
     # Filter: must have name
-    df = df.filter(
-        pl.col("name").is_not_null() & (pl.col("name") != "")
+    lf = (
+        lf.drop_nulls(subset=["name"])
+          .filter(pl.col("name").str.len_bytes() > 0)
     )
-    
-    invalid_count = before_filter - len(df)
-    if verbose:
-        print(f"   🗑️ Removed {invalid_count} rows with missing names")
+    filtered_lf = lf
     
     # Step 6: Calculate completeness score for deduplication
     if verbose:
         print("\n🔧 Step 6: Calculating data completeness...")
     
     # Calculate completeness score
+    columns = lf.collect_schema().names()
     completeness_fields = []
     for field in ["name", "domain", "industry", "employee_count", "country"]:
-        if field in df.columns:
+        if field in columns:
             completeness_fields.append(field)
     
     if completeness_fields:
-        score_expr = None
-        for field in completeness_fields:
-            field_score = pl.col(field).is_not_null().cast(pl.Int32)
-            if score_expr is None:
-                score_expr = field_score
-            else:
-                score_expr = score_expr + field_score
+        score_expr = pl.sum_horizontal([
+            pl.col(field).is_not_null().cast(pl.UInt8)
+            for field in completeness_fields
+        ])
         
-        df = df.with_columns([
+        lf = lf.with_columns([
             score_expr.alias("completeness_score")
         ])
     
@@ -199,91 +204,92 @@ def clean_accounts(input_path: str, output_path: str, verbose: bool = True) -> d
     if verbose:
         print("\n🔧 Step 7: Deduplicating accounts...")
     
-    before_dedup = len(df)
-    
-    # Deduplicate by domain first (if domain exists and is not null)
-    df_with_domain = df.filter(pl.col("domain").is_not_null())
-    df_without_domain = df.filter(pl.col("domain").is_null())
-    
-    if len(df_with_domain) > 0:
-        df_with_domain = (
-            df_with_domain
-            .sort("completeness_score", descending=True)
-            .unique(subset=["domain"], keep="first")
-        )
-        if verbose:
-            domain_dupes = before_dedup - len(df_with_domain) - len(df_without_domain)
-            if domain_dupes > 0:
-                print(f"   🗑️ Removed {domain_dupes} duplicate domains")
-    
-    # For records without domain, deduplicate by name (case-insensitive)
-    if len(df_without_domain) > 0:
-        df_without_domain = df_without_domain.with_columns([
-            pl.col("name").str.to_lowercase().alias("name_lower")
-        ])
-        df_without_domain = (
-            df_without_domain
-            .sort("completeness_score", descending=True)
-            .unique(subset=["name_lower"], keep="first")
-            .drop("name_lower")
-        )
+    # Dedup key: domain if present, otherwise the case-insensitive name
+    columns = lf.collect_schema().names()
+    dedup_key = pl.coalesce([
+        pl.col("domain"),
+        pl.concat_str([pl.lit("name:"), pl.col("name").str.to_lowercase()]),
+    ])
     
-    # Combine back together
-    if len(df_with_domain) > 0 and len(df_without_domain) > 0:
-        df = pl.concat([df_with_domain, df_without_domain])
-    elif len(df_with_domain) > 0:
-        df = df_with_domain
-    else:
-        df = df_without_domain
+    # Keep the most complete row per key in a single hash group-by pass
+    lf = (
+        lf.with_columns([dedup_key.alias("_dedup_key")])
+          .group_by("_dedup_key")
+          .agg(pl.all().get(pl.col("completeness_score").arg_max()))
+          .select(columns)
+    )
     
     # Drop completeness score
-    if "completeness_score" in df.columns:
-        df = df.drop("completeness_score")
-    
-    duplicate_count = before_dedup - len(df)
-    if verbose:
-        print(f"   🗑️ Total duplicates removed: {duplicate_count}")
+    if "completeness_score" in lf.collect_schema().names():
+        lf = lf.drop("completeness_score")
     
     # Step 8: Add metadata
-    df = df.with_columns([
-        pl.lit("sheet").alias("source")
+    lf = lf.with_columns([
+        pl.lit("sheet", dtype=pl.Categorical).alias("source")
     ])
     
-    # Step 9: Export cleaned data
-    final_count = len(df)
+    # Row counts for each stage, computed in the same run as the export
+    counts_lf = pl.concat([
+        scanned_lf.select(pl.len().alias("original_count")),
+        filtered_lf.select(pl.len().alias("filtered_count")),
+        lf.select(pl.len().alias("final_count")),
+    ], how="horizontal")
+    
+    return lf, counts_lf
+
+
+def print_accounts_summary(stats: dict) -> None:
+    """
+    Print the cleaning summary for accounts
     
+    Args:
+        stats: Dict with cleaning statistics
+    """
+    print("\n" + "=" * 60)
+    print("📊 CLEANING SUMMARY")
+    print("=" * 60)
+    print(f"  Original rows:           {stats['original_count']}")
+    print(f"  Invalid records filtered:{stats['invalid_filtered']}")
+    print(f"  Duplicates removed:      {stats['duplicates_removed']}")
+    print(f"  Final clean rows:        {stats['final_count']}")
+    print(f"  Data retained:           {stats['data_retained_pct']}%")
+    print("=" * 60)
+    print("✅ Account cleaning complete!\n")
+
+
+def clean_accounts(input_path: str, output_path: str, verbose: bool = True) -> dict:
+    """
+    Clean account/company data from CSV
+    
+    Args:
+        input_path: Path to input CSV file
+        output_path: Path to save cleaned CSV
+        verbose: Print progress messages
+        
+    Returns:
+        Dict with cleaning statistics
+    """
+    lf, counts_lf = build_accounts_lf(input_path, verbose=verbose)
+    
+    # Step 9: Export cleaned data
     if verbose:
         print(f"\n💾 Saving cleaned data to: {output_path}")
     
     try:
-        df.write_csv(output_path)
-        if verbose:
-            print(f"✅ Saved {final_count} clean accounts")
+        counts = sink_csv(lf, output_path, counts_lf)
+    except pl.exceptions.ComputeError as e:
+        # The CSV is only parsed when the pipeline runs, so bad input surfaces here
+        print(f"❌ Error reading CSV: {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Error saving CSV: {e}")
         sys.exit(1)
     
-    # Generate statistics
-    stats = {
-        "original_count": original_count,
-        "invalid_filtered": invalid_count,
-        "duplicates_removed": duplicate_count,
-        "final_count": final_count,
-        "data_retained_pct": round((final_count / original_count) * 100, 1) if original_count > 0 else 0,
-    }
+    stats = cleaning_stats(counts)
     
-    # Print summary
     if verbose:
-        print("\n" + "=" * 60)
-        print("📊 CLEANING SUMMARY")
-        print("=" * 60)
-        print(f"  Original rows:           {stats['original_count']}")
-        print(f"  Invalid records filtered:{stats['invalid_filtered']}")
-        print(f"  Duplicates removed:      {stats['duplicates_removed']}")
-        print(f"  Final clean rows:        {stats['final_count']}")
-        print(f"  Data retained:           {stats['data_retained_pct']}%")
-        print("=" * 60)
-        print("✅ Account cleaning complete!\n")
+        print(f"✅ Saved {stats['final_count']} clean accounts")
+        print_accounts_summary(stats)
     
     return stats
 
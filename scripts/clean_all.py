@@ -0,0 +1,139 @@
+"""
+Combined cleaning script
+Cleans account and contact CSVs together in a single Polars run
+
+Both pipelines are built as LazyFrames and executed with one pl.collect_all
+call, so the two files are scanned, cleaned and written in parallel instead
+of paying start-up and parse costs in two separate processes.
+
+Usage:
+    python clean_all.py \
+        --accounts incoming/accounts.csv --accounts-output incoming/accounts_clean.csv \
+        --contacts incoming/contacts.csv --contacts-output incoming/contacts_clean.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+import polars as pl
+from clean_accounts import build_accounts_lf, print_accounts_summary
+from clean_contacts import build_contacts_lf, print_contacts_summary
+from utils import cleaning_stats, sink_csv_all
+
+
+def clean_all(
+    accounts_input: str,
+    accounts_output: str,
+    contacts_input: str,
+    contacts_output: str,
+    verbose: bool = True,
+) -> dict:
+    """
+    Clean account and contact data from CSV in one run
+    
+    Args:
+        accounts_input: Path to input accounts CSV file
+        accounts_output: Path to save cleaned accounts CSV
+        contacts_input: Path to input contacts CSV file
+        contacts_output: Path to save cleaned contacts CSV
+        verbose: Print progress messages
+    
+    Returns:
+        Dict with "accounts" and "contacts" cleaning statistics
+    """
+    accounts_lf, accounts_counts_lf = build_accounts_lf(accounts_input, verbose=verbose)
+    if verbose:
+        print()
+    contacts_lf, contacts_counts_lf = build_contacts_lf(contacts_input, verbose=verbose)
+    
+    # Export both cleaned files in a single streaming run
+    if verbose:
+        print(f"\n💾 Saving cleaned accounts to: {accounts_output}")
+        print(f"💾 Saving cleaned contacts to: {contacts_output}")
+    
+    try:
+        accounts_counts, contacts_counts = sink_csv_all([
+            (accounts_lf, accounts_output, accounts_counts_lf),
+            (contacts_lf, contacts_output, contacts_counts_lf),
+        ])
+    except pl.exceptions.ComputeError as e:
+        # The CSVs are only parsed when the pipelines run, so bad input surfaces here
+        print(f"❌ Error reading CSV: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error saving CSV: {e}")
+        sys.exit(1)
+    
+    stats = {
+        "accounts": cleaning_stats(accounts_counts),
+        "contacts": cleaning_stats(contacts_counts),
+    }
+    
+    if verbose:
+        print(f"✅ Saved {stats['accounts']['final_count']} clean accounts")
+        print(f"✅ Saved {stats['contacts']['final_count']} clean contacts")
+        print_accounts_summary(stats["accounts"])
+        print_contacts_summary(stats["contacts"])
+    
+    return stats
+
+
+def main():
+    """Main CLI entry point"""
+    parser = argparse.ArgumentParser(
+        description="Clean and deduplicate account and contact CSVs in one run"
+    )
+    parser.add_argument(
+        "--accounts",
+        required=True,
+        help="Input accounts CSV file path"
+    )
+    parser.add_argument(
+        "--accounts-output",
+        required=True,
+        help="Output accounts CSV file path"
+    )
+    parser.add_argument(
+        "--contacts",
+        required=True,
+        help="Input contacts CSV file path"
+    )
+    parser.add_argument(
+        "--contacts-output",
+        required=True,
+        help="Output contacts CSV file path"
+    )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Suppress progress messages"
+    )
+    
+    args = parser.parse_args()
+    
+    # Validate input files exist
+    for input_path in [args.accounts, args.contacts]:
+        if not Path(input_path).exists():
+            print(f"❌ Error: Input file not found: {input_path}")
+            sys.exit(1)
+    
+    # Create output directories if needed
+    for output_path in [args.accounts_output, args.contacts_output]:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    
+    # Run cleaning
+    stats = clean_all(
+        accounts_input=args.accounts,
+        accounts_output=args.accounts_output,
+        contacts_input=args.contacts,
+        contacts_output=args.contacts_output,
+        verbose=not args.quiet
+    )
+    
+    # Exit with success
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
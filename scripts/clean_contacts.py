@@ -12,62 +12,69 @@ from pathlib import Path
 import polars as pl
 from utils import (
     extract_domain,
-    normalize_country,
-    clean_phone,
-    clean_linkedin_url,
+    normalize_country_expr,
+    clean_phone_expr,
+    clean_linkedin_expr,
     clean_email,
-    is_valid_email,
+    is_valid_email_expr,
     normalize_column_name,
+    cleaning_stats,
+    sink_csv,
     CONTACT_COLUMN_SCHEMA,
 )
 
 
-def clean_contacts(input_path: str, output_path: str, verbose: bool = True) -> dict:
+def build_contacts_lf(input_path: str, verbose: bool = True) -> tuple:
     """
-    Clean contact data from CSV
+    Build the lazy contact cleaning pipeline for a CSV
+    
+    Only the CSV schema is inferred here; the returned LazyFrames are
+    executed by sink_csv (or sink_csv_all when cleaning several files).
     
     Args:
         input_path: Path to input CSV file
-        output_path: Path to save cleaned CSV
         verbose: Print progress messages
         
     Returns:
-        Dict with cleaning statistics
+        Tuple of (cleaned LazyFrame, LazyFrame of row counts for the stats)
     """
     
     if verbose:
         print(f"📂 Reading contacts from: {input_path}")
     
-    # Load CSV
+    # Scan CSV lazily so the whole pipeline can run on the streaming engine
     try:
-        df = pl.read_csv(input_path)
+        lf = pl.scan_csv(input_path, infer_schema_length=10_000)
+        columns = lf.collect_schema().names()
     except Exception as e:
         print(f"❌ Error reading CSV: {e}")
         sys.exit(1)
     
-    original_count = len(df)
+    # Keep a handle on the scanned rows so they can be counted at export time
+    scanned_lf = lf
+    
     if verbose:
-        print(f"📊 Loaded {original_count} rows")
-        print(f"📋 Columns: {df.columns}")
+        print(f"📋 Columns: {columns}")
     
     # Step 1: Normalize column names
     if verbose:
         print("\n🔧 Step 1: Normalizing column names...")
     
-    df = df.rename({
+    lf = lf.rename({
         col: normalize_column_name(col)
-        for col in df.columns
+        for col in columns
     })
+    columns = lf.collect_schema().names()
     
     if verbose:
-        print(f"   ✅ Normalized to: {df.columns}")
+        print(f"   ✅ Normalized to: {columns}")
     
     # Step 2: Clean email addresses (critical field)
     if verbose:
         print("\n🔧 Step 2: Cleaning email addresses...")
     
-    if "email" in df.columns:
-        df = df.with_columns([
+    if "email" in columns:
+        lf = lf.with_columns([
             pl.col("email").map_elements(clean_email, return_dtype=pl.Utf8).alias("email")
         ])
     else:
@@ -76,9 +83,9 @@ def clean_contacts(input_path: str, output_path: str, verbose: bool = True) -> d
         possible_email_cols = ["email_address", "e_mail", "contact_email"]
         found = False
         for col in possible_email_cols:
-            if col in df.columns:
-                df = df.rename({col: "email"})
-                df = df.with_columns([
+            if col in columns:
+                lf = lf.rename({col: "email"})
+                lf = lf.with_columns([
                     pl.col("email").map_elements(clean_email, return_dtype=pl.Utf8).alias("email")
                 ])
                 found = True
@@ -94,10 +101,9 @@ def clean_contacts(input_path: str, output_path: str, verbose: bool = True) -> d
     if verbose:
         print("\n🔧 Step 3: Extracting domains from emails...")
     
-    df = df.with_columns([
+    lf = lf.with_columns([
         pl.col("email")
-          .str.split("@")
-          .list.get(1)
+          .str.extract(r"@([^@]+)$", 1)
           .alias("email_domain")
     ])
     
@@ -105,81 +111,81 @@ def clean_contacts(input_path: str, output_path: str, verbose: bool = True) -> d
     if verbose:
         print("\n🔧 Step 4: Standardizing data fields...")
     
+    # Collect field cleaning expressions and apply them in one pass
+    clean_exprs = []
+    
     # Country normalization
-    if "country" in df.columns:
-        df = df.with_columns([
-            pl.col("country").map_elements(normalize_country, return_dtype=pl.Utf8).alias("country")
-        ])
+    if "country" in columns:
+        clean_exprs.append(
+            normalize_country_expr(pl.col("country")).cast(pl.Categorical).alias("country")
+        )
         if verbose:
             print("   ✅ Normalized countries")
     
     # Phone cleaning
-    if "phone" in df.columns:
-        df = df.with_columns([
-            pl.col("phone").map_elements(clean_phone, return_dtype=pl.Utf8).alias("phone")
-        ])
+    if "phone" in columns:
+        clean_exprs.append(
+            clean_phone_expr(pl.col("phone")).alias("phone")
+        )
         if verbose:
             print("   ✅ Cleaned phone numbers")
     
     # LinkedIn URL cleaning
-    if "linkedin" in df.columns:
-        df = df.with_columns([
-            pl.col("linkedin").map_elements(clean_linkedin_url, return_dtype=pl.Utf8).alias("linkedin")
-        ])
+    if "linkedin" in columns:
+        clean_exprs.append(
+            clean_linkedin_expr(pl.col("linkedin")).alias("linkedin")
+        )
         if verbose:
             print("   ✅ Standardized LinkedIn URLs")
     
     # Clean full_name if exists
-    if "full_name" in df.columns:
-        df = df.with_columns([
-            pl.col("full_name").str.strip().alias("full_name")
-        ])
+    if "full_name" in columns:
+        clean_exprs.append(
+            pl.col("full_name").str.strip_chars().alias("full_name")
+        )
     
     # Clean title if exists
-    if "title" in df.columns:
-        df = df.with_columns([
-            pl.col("title")
-              .str.strip()
-              .map_elements(lambda x: None if x == "N/A" else x, return_dtype=pl.Utf8)
+    if "title" in columns:
+        title = pl.col("title").str.strip_chars()
+        clean_exprs.append(
+            pl.when(title.is_in(["N/A", "n/a", ""]))
+              .then(None)
+              .otherwise(title)
               .alias("title")
-        ])
+        )
+    
+    if clean_exprs:
+        lf = lf.with_columns(clean_exprs)
     
     # Step 5: Filter out invalid emails
     if verbose:
         print("\n🔧 Step 5: Filtering invalid emails...")
     
-    before_filter = len(df)
-    
     # Filter rows with valid emails
-    df = df.filter(
-        pl.col("email").map_elements(is_valid_email, return_dtype=pl.Boolean)
+    lf = lf.filter(
+        is_valid_email_expr(pl.col("email"))
     )
-    
-    invalid_count = before_filter - len(df)
-    if verbose:
-        print(f"   🗑️ Removed {invalid_count} rows with invalid emails")
+    filtered_lf = lf
     
     # Step 6: Calculate completeness score for deduplication
     if verbose:
         print("\n🔧 Step 6: Calculating data completeness...")
     
     # Calculate completeness score (used for keeping best duplicate)
+    columns = lf.collect_schema().names()
     completeness_fields = []
     for field in ["full_name", "email", "title", "phone", "linkedin"]:
-        if field in df.columns:
+        if field in columns:
             completeness_fields.append(field)
     
     if completeness_fields:
         # Build completeness score expression
-        score_expr = None
-        for field in completeness_fields:
-            field_score = pl.col(field).is_not_null().cast(pl.Int32)
-            if score_expr is None:
-                score_expr = field_score
-            else:
-                score_expr = score_expr + field_score
+        score_expr = pl.sum_horizontal([
+            pl.col(field).is_not_null().cast(pl.UInt8)
+            for field in completeness_fields
+        ])
         
-        df = df.with_columns([
+        lf = lf.with_columns([
             score_expr.alias("completeness_score")
         ])
     
@@ -187,62 +193,85 @@ def clean_contacts(input_path: str, output_path: str, verbose: bool = True) -> d
     if verbose:
         print("\n🔧 Step 7: Deduplicating contacts...")
     
-    before_dedup = len(df)
-    
-    # Sort by completeness score (highest first) then deduplicate
-    df = (
-        df.sort("completeness_score", descending=True)
-          .unique(subset=["email"], keep="first")
+    # Keep the most complete row per email (hash group-by, no full sort)
+    columns = lf.collect_schema().names()
+    lf = (
+        lf.group_by("email")
+          .agg(pl.all().get(pl.col("completeness_score").arg_max()))
+          .select(columns)
     )
     
     # Drop completeness score column
-    if "completeness_score" in df.columns:
-        df = df.drop("completeness_score")
-    
-    duplicate_count = before_dedup - len(df)
-    if verbose:
-        print(f"   🗑️ Removed {duplicate_count} duplicate contacts")
+    if "completeness_score" in lf.collect_schema().names():
+        lf = lf.drop("completeness_score")
     
     # Step 8: Add metadata
-    df = df.with_columns([
-        pl.lit("sheet").alias("source")
+    lf = lf.with_columns([
+        pl.lit("sheet", dtype=pl.Categorical).alias("source")
     ])
     
-    # Step 9: Export cleaned data
-    final_count = len(df)
+    # Row counts for each stage, computed in the same run as the export
+    counts_lf = pl.concat([
+        scanned_lf.select(pl.len().alias("original_count")),
+        filtered_lf.select(pl.len().alias("filtered_count")),
+        lf.select(pl.len().alias("final_count")),
+    ], how="horizontal")
+    
+    return lf, counts_lf
+
+
+def print_contacts_summary(stats: dict) -> None:
+    """
+    Print the cleaning summary for contacts
+    
+    Args:
+        stats: Dict with cleaning statistics
+    """
+    print("\n" + "=" * 60)
+    print("📊 CLEANING SUMMARY")
+    print("=" * 60)
+    print(f"  Original rows:           {stats['original_count']}")
+    print(f"  Invalid emails filtered: {stats['invalid_filtered']}")
+    print(f"  Duplicates removed:      {stats['duplicates_removed']}")
+    print(f"  Final clean rows:        {stats['final_count']}")
+    print(f"  Data retained:           {stats['data_retained_pct']}%")
+    print("=" * 60)
+    print("✅ Contact cleaning complete!\n")
+
+
+def clean_contacts(input_path: str, output_path: str, verbose: bool = True) -> dict:
+    """
+    Clean contact data from CSV
     
+    Args:
+        input_path: Path to input CSV file
+        output_path: Path to save cleaned CSV
+        verbose: Print progress messages
+        
+    Returns:
+        Dict with cleaning statistics
+    """
+    lf, counts_lf = build_contacts_lf(input_path, verbose=verbose)
+    
+    # Step 9: Export cleaned data
     if verbose:
         print(f"\n💾 Saving cleaned data to: {output_path}")
     
     try:
-        df.write_csv(output_path)
-        if verbose:
-            print(f"✅ Saved {final_count} clean contacts")
+        counts = sink_csv(lf, output_path, counts_lf)
+    except pl.exceptions.ComputeError as e:
+        # The CSV is only parsed when the pipeline runs, so bad input surfaces here
+        print(f"❌ Error reading CSV: {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Error saving CSV: {e}")
         sys.exit(1)
     
-    # Generate statistics
-    stats = {
-        "original_count": original_count,
-        "invalid_filtered": invalid_count,
-        "duplicates_removed": duplicate_count,
-        "final_count": final_count,
-        "data_retained_pct": round((final_count / original_count) * 100, 1) if original_count > 0 else 0,
-    }
+    stats = cleaning_stats(counts)
     
-    # Print summary
     if verbose:
-        print("\n" + "=" * 60)
-        print("📊 CLEANING SUMMARY")
-        print("=" * 60)
-        print(f"  Original rows:           {stats['original_count']}")
-        print(f"  Invalid emails filtered: {stats['invalid_filtered']}")
-        print(f"  Duplicates removed:      {stats['duplicates_removed']}")
-        print(f"  Final clean rows:        {stats['final_count']}")
-        print(f"  Data retained:           {stats['data_retained_pct']}%")
-        print("=" * 60)
-        print("✅ Contact cleaning complete!\n")
+        print(f"✅ Saved {stats['final_count']} clean contacts")
+        print_contacts_summary(stats)
     
     return stats
 
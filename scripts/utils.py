@@ -4,8 +4,11 @@ Used by clean_contacts.py and clean_accounts.py
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 
+import polars as pl
+
 
 # Country normalization mapping
 COUNTRY_MAP = {
@@ -22,6 +25,16 @@ COUNTRY_MAP = {
 }
 
 
+# Runs of whitespace and/or underscores in column names
+_WS_RE = re.compile(r"[\s_]+")
+
+
+# Generic/test email prefixes and domains filtered out during validation
+INVALID_EMAIL_PREFIXES = ["test@", "example@", "info@", "admin@", "noreply@"]
+INVALID_EMAIL_DOMAINS = ["example.com", "test.com", "localhost"]
+
+
+@lru_cache(maxsize=8192)
 def extract_domain(url: Optional[str]) -> Optional[str]:
     """
     Extract clean domain from a website URL or email
@@ -44,11 +57,10 @@ def extract_domain(url: Optional[str]) -> Optional[str]:
     domain = str(url).lower().strip()
     
     # Remove common protocols
-    domain = domain.replace("http://", "")
-    domain = domain.replace("https://", "")
+    domain = re.sub(r"^https?://", "", domain)
     
     # Remove www prefix
-    domain = domain.replace("www.", "")
+    domain = re.sub(r"^www\.", "", domain)
     
     # Take only the domain part (before first slash)
     domain = domain.split("/")[0]
@@ -63,6 +75,31 @@ def extract_domain(url: Optional[str]) -> Optional[str]:
     return domain
 
 
+def extract_domain_expr(col: pl.Expr) -> pl.Expr:
+    """
+    Vectorized version of extract_domain for use inside Polars expressions
+    
+    Args:
+        col: Expression for a column of website URLs or domain strings
+        
+    Returns:
+        Expression yielding the clean domain, or null if invalid
+    """
+    domain = (
+        col.str.to_lowercase()
+           .str.strip_chars()
+           .str.replace(r"^https?://", "")
+           .str.replace(r"^www\.", "")
+           .str.split("/")
+           .list.first()
+           .str.strip_chars_end(".")
+    )
+    
+    # Basic validation - should have at least one dot
+    return pl.when(domain.str.contains(".", literal=True)).then(domain)
+
+
+@lru_cache(maxsize=8192)
 def normalize_country(country: Optional[str]) -> Optional[str]:
     """
     Normalize country names to standard format
@@ -92,6 +129,26 @@ def normalize_country(country: Optional[str]) -> Optional[str]:
     return country.strip().title()
 
 
+def normalize_country_expr(col: pl.Expr) -> pl.Expr:
+    """
+    Vectorized version of normalize_country for use inside Polars expressions
+    
+    Args:
+        col: Expression for a column of country names or codes
+        
+    Returns:
+        Expression yielding the standardized country name
+    """
+    clean = col.str.strip_chars().str.to_lowercase()
+    
+    return (
+        pl.when(col.str.len_bytes() == 0).then(None)
+          .when(clean.is_in(list(COUNTRY_MAP))).then(clean.replace(COUNTRY_MAP))
+          .otherwise(col.str.strip_chars().str.to_titlecase())
+    )
+
+
+@lru_cache(maxsize=8192)
 def clean_phone(phone: Optional[str]) -> Optional[str]:
     """
     Clean phone numbers to consistent format
@@ -130,6 +187,29 @@ def clean_phone(phone: Optional[str]) -> Optional[str]:
     return digits_only
 
 
+def clean_phone_expr(col: pl.Expr) -> pl.Expr:
+    """
+    Vectorized version of clean_phone for use inside Polars expressions
+    
+    Args:
+        col: Expression for a column of phone numbers
+        
+    Returns:
+        Expression yielding the cleaned phone number, or null if empty
+    """
+    phone = col.str.strip_chars()
+    
+    # Remove all non-digit characters
+    digits_only = phone.str.replace_all(r"[^0-9]", "")
+    
+    # Add + back if it was there
+    prefix = pl.when(phone.str.starts_with("+")).then(pl.lit("+")).otherwise(pl.lit(""))
+    
+    # Null out values with no digits
+    return pl.when(digits_only.str.len_bytes() == 0).then(None).otherwise(prefix + digits_only)
+
+
+@lru_cache(maxsize=8192)
 def clean_linkedin_url(url: Optional[str]) -> Optional[str]:
     """
     Standardize LinkedIn URLs to consistent format
@@ -152,9 +232,8 @@ def clean_linkedin_url(url: Optional[str]) -> Optional[str]:
     clean_url = str(url).lower().strip()
     
     # Remove protocol and www
-    clean_url = clean_url.replace("https://", "")
-    clean_url = clean_url.replace("http://", "")
-    clean_url = clean_url.replace("www.", "")
+    clean_url = re.sub(r"^https?://", "", clean_url)
+    clean_url = re.sub(r"^www\.", "", clean_url)
     
     # Remove trailing slash
     clean_url = clean_url.rstrip("/")
@@ -167,6 +246,32 @@ def clean_linkedin_url(url: Optional[str]) -> Optional[str]:
     return f"https://{clean_url}"
 
 
+def clean_linkedin_expr(col: pl.Expr) -> pl.Expr:
+    """
+    Vectorized version of clean_linkedin_url for use inside Polars expressions
+    
+    Args:
+        col: Expression for a column of LinkedIn URLs
+        
+    Returns:
+        Expression yielding the standardized LinkedIn URL, or null if invalid
+    """
+    clean_url = (
+        col.str.to_lowercase()
+           .str.strip_chars()
+           .str.replace(r"^https?://", "")
+           .str.replace(r"^www\.", "")
+           .str.strip_chars_end("/")
+    )
+    
+    # Validate it's a LinkedIn URL and add standard protocol
+    return (
+        pl.when(clean_url.str.starts_with("linkedin.com"))
+          .then(pl.concat_str([pl.lit("https://"), clean_url]))
+          .otherwise(None)
+    )
+
+
 def clean_email(email: Optional[str]) -> Optional[str]:
     """
     Clean and validate email addresses
@@ -210,20 +315,44 @@ def is_valid_email(email: Optional[str]) -> bool:
         return False
     
     # Filter out test/generic emails
-    invalid_prefixes = ["test@", "example@", "info@", "admin@", "noreply@"]
-    for prefix in invalid_prefixes:
+    for prefix in INVALID_EMAIL_PREFIXES:
         if email_lower.startswith(prefix):
             return False
     
     # Filter out common test domains
-    invalid_domains = ["example.com", "test.com", "localhost"]
     domain = email_lower.split("@")[-1]
-    if domain in invalid_domains:
+    if domain in INVALID_EMAIL_DOMAINS:
         return False
     
     return True
 
 
+def is_valid_email_expr(col: pl.Expr) -> pl.Expr:
+    """
+    Vectorized version of is_valid_email for use inside Polars filters
+    
+    Args:
+        col: Expression for a column of email addresses
+        
+    Returns:
+        Boolean expression, True for valid emails and False otherwise
+    """
+    email_lower = col.str.to_lowercase()
+    
+    # Must contain @
+    has_at = email_lower.str.contains("@", literal=True)
+    
+    # Filter out test/generic emails
+    invalid_prefix = pl.any_horizontal([
+        email_lower.str.starts_with(prefix) for prefix in INVALID_EMAIL_PREFIXES
+    ])
+    
+    # Filter out common test domains
+    invalid_domain = email_lower.str.split("@").list.last().is_in(INVALID_EMAIL_DOMAINS)
+    
+    return (has_at & invalid_prefix.not_() & invalid_domain.not_()).fill_null(False)
+
+
 def calculate_completeness_score(row_dict: dict, fields: list) -> int:
     """
     Calculate how complete a data row is based on non-null fields
@@ -258,20 +387,8 @@ def normalize_column_name(col: str) -> str:
     Returns:
         Normalized column name
     """
-    # Strip whitespace
-    clean = col.strip()
-    
-    # Convert to lowercase
-    clean = clean.lower()
-    
-    # Replace spaces with underscores
-    clean = clean.replace(" ", "_")
-    
-    # Remove any duplicate underscores
-    while "__" in clean:
-        clean = clean.replace("__", "_")
-    
-    return clean
+    # Collapse runs of whitespace/underscores into a single underscore
+    return _WS_RE.sub("_", col.strip().lower()).strip("_")
 
 
 def get_column_mapping(actual_columns: list, expected_schema: dict) -> dict:
@@ -303,6 +420,74 @@ def get_column_mapping(actual_columns: list, expected_schema: dict) -> dict:
     return mapping
 
 
+def sink_csv_all(jobs: list) -> list:
+    """
+    Write several LazyFrames to CSV and collect their row counts in one run
+    
+    All queries are submitted together with pl.collect_all on the streaming
+    engine, so each CSV is scanned and cleaned once and independent files
+    are processed in parallel. Falls back to collecting in memory if a
+    query cannot be sunk (e.g. an operation the streaming sink does not
+    support yet).
+    
+    Args:
+        jobs: List of (cleaned LazyFrame, output path, counts LazyFrame)
+        
+    Returns:
+        List of collected counts DataFrames, in the same order as jobs
+    """
+    counts_lfs = [counts_lf for _, _, counts_lf in jobs]
+    
+    try:
+        sinks = [lf.sink_csv(output_path, lazy=True) for lf, output_path, _ in jobs]
+        results = pl.collect_all(sinks + counts_lfs, engine="streaming")
+    except pl.exceptions.InvalidOperationError:
+        results = pl.collect_all([lf for lf, _, _ in jobs] + counts_lfs, engine="streaming")
+        for df, (_, output_path, _) in zip(results, jobs):
+            df.write_csv(output_path)
+    
+    return results[len(jobs):]
+
+
+def sink_csv(lf: pl.LazyFrame, output_path: str, counts_lf: pl.LazyFrame) -> pl.DataFrame:
+    """
+    Write a LazyFrame to CSV and collect its row counts in one streaming run
+    
+    Args:
+        lf: LazyFrame holding the cleaned data
+        output_path: Path to save the CSV
+        counts_lf: LazyFrame computing row counts for the cleaning stats
+        
+    Returns:
+        Collected counts_lf
+    """
+    return sink_csv_all([(lf, output_path, counts_lf)])[0]
+
+
+def cleaning_stats(counts: pl.DataFrame) -> dict:
+    """
+    Build the cleaning statistics dict from collected row counts
+    
+    Args:
+        counts: Single-row DataFrame with original_count, filtered_count
+            and final_count columns
+        
+    Returns:
+        Dict with cleaning statistics
+    """
+    row = counts.row(0, named=True)
+    original_count = row["original_count"]
+    final_count = row["final_count"]
+    
+    return {
+        "original_count": original_count,
+        "invalid_filtered": original_count - row["filtered_count"],
+        "duplicates_removed": row["filtered_count"] - final_count,
+        "final_count": final_count,
+        "data_retained_pct": round((final_count / original_count) * 100, 1) if original_count > 0 else 0,
+    }
+
+
 # Common column name variations for contacts
 CONTACT_COLUMN_SCHEMA = {
     "full_name": ["full_name", "full name", "name", "contact name", "contact_name"],